@@ -0,0 +1,137 @@
+import bisect
+from datetime import datetime, timedelta, timezone
+
+from lazy_import import LazyModule
+
+swe = LazyModule('swisseph')
+
+
+# The Ascendant only depends on RAMC (local sidereal time), latitude and the
+# obliquity of the ecliptic, so one table per latitude covers every day:
+# tabulate ASC against RAMC once, invert it, and "when does the Ascendant
+# reach longitude X" becomes a lookup plus interpolation.
+
+TABLE_STEP = 0.05  # RAMC resolution of the table in degrees
+OBLIQUITY_BAND = 0.01  # tables are shared for obliquities within this band (deg)
+SIDEREAL_RATE = 360.98564736629  # RAMC advance in degrees per day
+MAX_LATITUDE = 66.0  # beyond the polar circles the Ascendant is not monotonic
+
+_tables = {}
+
+
+def wrap180(angle):
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+def obliquity(jd):
+    # True obliquity of the ecliptic in degrees
+    return swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+
+
+def ramc_at(jd, geo_lon):
+    # Local apparent sidereal time in degrees, as used by swe.houses
+    return (swe.sidtime(jd) * 15.0 + geo_lon) % 360.0
+
+
+def jd_to_datetime(jd):
+    # UTC datetime for a julian day (UT)
+    year, month, day, hour = swe.revjul(jd)
+    return datetime(year, month, day, tzinfo=timezone.utc) + timedelta(hours=hour)
+
+
+class AscendantTable:
+    def __init__(self, latitude, eps, step=TABLE_STEP):
+        if abs(latitude) > MAX_LATITUDE:
+            raise ValueError(f"Ascendant lookup needs |latitude| <= {MAX_LATITUDE}, got {latitude}")
+        self.latitude = latitude
+        self.eps = eps
+        self.step = step
+        count = int(round(360.0 / step))
+        self.ramcs = [i * step for i in range(count + 1)]
+        # Tropical Ascendant, unwrapped so it increases over one revolution
+        self.ascs = []
+        prev = None
+        for ramc in self.ramcs:
+            asc = swe.houses_armc(ramc, latitude, eps, b'P')[1][0]
+            if prev is not None:
+                asc = prev + (asc - prev) % 360.0
+            self.ascs.append(asc)
+            prev = asc
+
+    def asc_at(self, ramc):
+        # Tropical Ascendant for a RAMC (degrees)
+        x = (ramc % 360.0) / self.step
+        i = min(int(x), len(self.ramcs) - 2)
+        frac = x - i
+        return (self.ascs[i] + (self.ascs[i + 1] - self.ascs[i]) * frac) % 360.0
+
+    def ramc_for(self, asc):
+        # Inverse lookup: RAMC at which the Ascendant equals the tropical longitude asc
+        base = self.ascs[0]
+        target = base + (asc - base) % 360.0
+        i = bisect.bisect_right(self.ascs, target) - 1
+        i = max(0, min(i, len(self.ascs) - 2))
+        span = self.ascs[i + 1] - self.ascs[i]
+        frac = (target - self.ascs[i]) / span if span else 0.0
+        return (self.ramcs[i] + self.step * frac) % 360.0
+
+    def slope(self, ramc):
+        # dASC/dRAMC around a RAMC, used to convert longitude error to time
+        i = min(int((ramc % 360.0) / self.step), len(self.ramcs) - 2)
+        return (self.ascs[i + 1] - self.ascs[i]) / self.step
+
+
+def get_table(latitude, eps):
+    # Tables are cached per latitude and obliquity band
+    key = (round(latitude, 4), round(eps / OBLIQUITY_BAND))
+    table = _tables.get(key)
+    if table is None:
+        table = AscendantTable(latitude, round(eps / OBLIQUITY_BAND) * OBLIQUITY_BAND)
+        _tables[key] = table
+    return table
+
+
+def next_crossing(jd, table, geo_lon, target, refine=True):
+    # First time after jd at which the Ascendant equals target(jd) (tropical
+    # degrees). target must move slowly compared to the Ascendant (nodes,
+    # planets, fixed points); a few evaluations per event are enough.
+    dr = (table.ramc_for(target(jd)) - ramc_at(jd, geo_lon)) % 360.0
+    t = jd + dr / SIDEREAL_RATE
+    for _ in range(2):
+        t += wrap180(table.ramc_for(target(t)) - ramc_at(t, geo_lon)) / SIDEREAL_RATE
+    if refine:
+        # One Newton step against the exact Ascendant removes the table and
+        # obliquity-band error
+        asc = swe.houses(t, table.latitude, geo_lon, b'P')[1][0]
+        rate = table.slope(ramc_at(t, geo_lon)) * SIDEREAL_RATE
+        t += wrap180(target(t) - asc) / rate
+    return t
+
+
+def find_crossings(jd_start, jd_end, latitude, geo_lon, target, refine=True):
+    # All times in [jd_start, jd_end] at which the Ascendant equals target(jd)
+    table = get_table(latitude, obliquity((jd_start + jd_end) / 2.0))
+    events = []
+    jd = jd_start
+    while True:
+        t = next_crossing(jd, table, geo_lon, target, refine)
+        if t > jd_end:
+            break
+        if t >= jd_start:
+            events.append(t)
+        # Skip ahead so the same crossing is not found again
+        jd = t + 0.01
+    return events
+
+
+def find_windows(jd_start, jd_end, latitude, geo_lon, target, orb):
+    # (enter, exit) times during which the Ascendant is within orb of target(jd)
+    table = get_table(latitude, obliquity((jd_start + jd_end) / 2.0))
+    windows = []
+    enters = find_crossings(jd_start - 1.0, jd_end, latitude, geo_lon, lambda jd: target(jd) - orb)
+    for t_in in enters:
+        t_out = next_crossing(t_in, table, geo_lon, lambda jd: target(jd) + orb)
+        if t_out < jd_start:
+            continue
+        windows.append((max(t_in, jd_start), min(t_out, jd_end)))
+    return windows
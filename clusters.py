@@ -0,0 +1,110 @@
+# Stelliums / multi-planet conjunctions: at each step the selected bodies'
+# longitudes are sorted around the circle and a sliding window finds every
+# group of at least k bodies that fits inside the orb. Sorting makes this
+# O(n log n) per step instead of testing every pair.
+
+REFINE_PRECISION = 1.0 / 1440  # bisect entry/exit times down to one minute (days)
+
+
+def circular_span(lons):
+    # Smallest arc (degrees) that contains all the longitudes
+    if len(lons) < 2:
+        return 0.0
+    ordered = sorted(lon % 360.0 for lon in lons)
+    largest_gap = ordered[0] + 360.0 - ordered[-1]
+    for a, b in zip(ordered, ordered[1:]):
+        largest_gap = max(largest_gap, b - a)
+    return 360.0 - largest_gap
+
+
+def find_clusters(lons, orb, k=3):
+    # Maximal groups of at least k bodies whose longitudes fit within orb.
+    # lons is a list of longitudes; returns frozensets of their positions.
+    n = len(lons)
+    if n < k or k < 1:
+        return []
+    order = sorted(range(n), key=lambda i: lons[i] % 360.0)
+    ring = [lons[i] % 360.0 for i in order]
+    # Unroll the circle once so windows can run across 0°
+    ext = ring + [lon + 360.0 for lon in ring]
+
+    ends = []
+    j = 0
+    for i in range(n):
+        j = max(j, i + 1)
+        while j < i + n and ext[j] - ext[i] <= orb:
+            j += 1
+        ends.append(j)
+
+    if orb >= 180.0:
+        # Wide orbs: windows can contain windows that start elsewhere on the
+        # circle, so keep every window and drop those inside another
+        windows = []
+        for i in range(n):
+            window = frozenset(order[m % n] for m in range(i, ends[i]))
+            if ends[i] - i >= k and window not in windows:
+                windows.append(window)
+        return [w for w in windows if not any(w < other for other in windows)]
+
+    clusters = []
+    seen = set()
+    for i in range(n):
+        j = ends[i]
+        if j - i < k:
+            continue
+        # Contained in the previous window (same end), or in a window that
+        # started near 360° and wrapped past this one
+        if i > 0 and ends[i - 1] == j:
+            continue
+        if j + n <= ends[-1]:
+            continue
+        members = frozenset(order[m % n] for m in range(i, j))
+        if members not in seen:
+            seen.add(members)
+            clusters.append(members)
+    return clusters
+
+
+def _refine(jd_before, jd_after, present_after, members, longitudes_at, orb, k, precision):
+    # Bisect the moment `members` appears (present_after=True) or disappears
+    lo, hi = jd_before, jd_after
+    while hi - lo > precision:
+        mid = (lo + hi) / 2.0
+        present = members in find_clusters(longitudes_at(mid), orb, k)
+        if present == present_after:
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
+def scan_clusters(jd_start, jd_end, step_days, longitudes_at, orb, k=3, precision=REFINE_PRECISION):
+    # Scan [jd_start, jd_end] in steps of step_days. longitudes_at(jd) returns
+    # the longitudes of the bodies in a fixed order. Returns a list of
+    # (members, jd_enter, jd_exit) sorted by entry; members are positions in
+    # that order. jd_enter is jd_start for clusters already formed at the
+    # start and jd_exit is None for clusters still formed at the end.
+    events = []
+    active = {}  # members -> jd_enter
+    prev_jd = None
+    jd = jd_start
+    while True:
+        current = set(find_clusters(longitudes_at(jd), orb, k))
+        for members in current:
+            if members not in active:
+                if prev_jd is None:
+                    active[members] = jd
+                else:
+                    active[members] = _refine(prev_jd, jd, True, members, longitudes_at, orb, k, precision)
+        for members in list(active):
+            if members not in current:
+                jd_exit = _refine(prev_jd, jd, False, members, longitudes_at, orb, k, precision)
+                events.append((members, active.pop(members), jd_exit))
+        if jd >= jd_end:
+            break
+        prev_jd = jd
+        jd = min(jd + step_days, jd_end)
+    for members, jd_enter in active.items():
+        events.append((members, jd_enter, None))
+    events.sort(key=lambda e: (e[1], sorted(e[0])))
+    return events
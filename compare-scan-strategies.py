@@ -0,0 +1,263 @@
+import sys
+import swisseph as swe
+import ephemeris
+import ascendant_table
+import clusters
+import crossings
+import scan_compare
+from scan_compare import Event, SECOND
+from sidereal import rahu_longitude, ketu_longitude
+
+# Fixed, deterministic cases: every optimized scan strategy is compared with a
+# dense brute-force reference over the same range and locations. Run with no
+# arguments for all cases, or name the cases to run.
+
+MINUTE = 60 * SECOND
+
+# Ascendant / node crossings (ke-ra-rising-independant-time.py)
+CROSSING_LOCATIONS = {
+    'London': (51.5074, -0.1278),
+    'Chicago': (41.8781, -87.6298),
+    'Sydney': (-33.8688, 151.2093),
+    'India': (28.6139, 77.2090),
+}
+CROSSING_RANGE = ((2025, 5, 1, 0.0), (2025, 5, 15, 0.0))
+
+# Ascendant within orb of a node (ke-ra-rising.py)
+WINDOW_LOCATION = (28.6139, 77.2090)
+WINDOW_RANGE = ((2025, 5, 1, 0.0), (2025, 5, 31, 0.0))
+WINDOW_ORB = 1.0
+
+# Aspects and sign ingresses (generate_dates)
+ASPECT_RANGE = ((2025, 1, 1, 0.0), (2025, 7, 1, 0.0))
+ASPECT_BODIES = [('Sun', swe.SUN), ('Moon', swe.MOON), ('Venus', swe.VENUS), ('Mars', swe.MARS)]
+ASPECTS = [(0, 1, 90.0), (2, 3, 60.0)]  # Sun square Moon, Venus sextile Mars
+INGRESS_BODY = 1  # Moon entering each sign
+AYANAMSA = swe.SIDM_LAHIRI
+
+# Stelliums (generate_dates with three or more bodies)
+CLUSTER_RANGE = ((2025, 1, 1, 0.0), (2026, 1, 1, 0.0))
+CLUSTER_BODIES = [('Sun', swe.SUN), ('Mercury', swe.MERCURY), ('Venus', swe.VENUS),
+                  ('Mars', swe.MARS), ('Saturn', swe.SATURN)]
+CLUSTER_ORB = 10.0
+CLUSTER_MIN = 3
+
+# Matching tolerance per case (days)
+TOLERANCES = {
+    'crossings': 2 * MINUTE,
+    'windows': 15 * MINUTE,
+    'aspects': 10 * MINUTE,
+    'clusters': 10 * MINUTE,
+}
+
+
+def julday_range(date_range):
+    return tuple(swe.julday(*d) for d in date_range)
+
+
+def asc_tropical(jd, lat, lon):
+    return swe.houses(jd, lat, lon, b'P')[1][0]
+
+
+def longitudes_reader(provider, bodies):
+    # longitudes_at(jd) for the given bodies from one provider
+    flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL
+
+    def longitudes_at(jd):
+        return [provider.longitude(jd, body, flags) for _, body in bodies]
+    return longitudes_at
+
+
+def crossings_case():
+    # Reference: 1-minute grid, each sign change bisected to 0.1 s
+    jd_start, jd_end = julday_range(CROSSING_RANGE)
+    nodes = (('Rahu', rahu_longitude), ('Ketu', ketu_longitude))
+
+    def reference():
+        functions = {}
+        for name, (lat, lon) in CROSSING_LOCATIONS.items():
+            for node, target in nodes:
+                functions[f"{name} {node}"] = (
+                    lambda jd, lat=lat, lon=lon, target=target:
+                    ascendant_table.wrap180(asc_tropical(jd, lat, lon) - target(jd)))
+        return scan_compare.dense_crossings(jd_start, jd_end, MINUTE, functions)
+
+    def minute_scan():
+        # The original script: 1-minute steps, report the step after the sign change
+        events = []
+        for name, (lat, lon) in CROSSING_LOCATIONS.items():
+            for node, target in nodes:
+                prev = None
+                for n in range(int((jd_end - jd_start) / MINUTE) + 1):
+                    jd = jd_start + n * MINUTE
+                    value = ascendant_table.wrap180(asc_tropical(jd, lat, lon) - target(jd))
+                    if prev is not None and (prev < 0.0) != (value < 0.0) and abs(value - prev) < 180.0:
+                        events.append(Event(jd, f"{name} {node}"))
+                    prev = value
+        return events
+
+    def table(refine):
+        def run():
+            events = []
+            for name, (lat, lon) in CROSSING_LOCATIONS.items():
+                for node, target in nodes:
+                    for jd in ascendant_table.find_crossings(jd_start, jd_end, lat, lon, target, refine):
+                        events.append(Event(jd, f"{name} {node}"))
+            return events
+        return run
+
+    return reference, [
+        ('1-minute scan', minute_scan),
+        ('ascendant table', table(True)),
+        ('ascendant table, no refine', table(False)),
+    ]
+
+
+def windows_case():
+    # Window entry / exit: Ascendant crossing node - orb / node + orb
+    jd_start, jd_end = julday_range(WINDOW_RANGE)
+    lat, lon = WINDOW_LOCATION
+    nodes = (('Rahu', rahu_longitude), ('Ketu', ketu_longitude))
+
+    def reference():
+        functions = {}
+        for node, target in nodes:
+            for kind, offset in (('enter', -WINDOW_ORB), ('exit', WINDOW_ORB)):
+                functions[f"{node} {kind}"] = (
+                    lambda jd, target=target, offset=offset:
+                    ascendant_table.wrap180(asc_tropical(jd, lat, lon) - target(jd) - offset))
+        return scan_compare.dense_crossings(jd_start, jd_end, MINUTE, functions)
+
+    def grid_scan():
+        # The original script: 10-minute steps, first and last step inside the orb
+        events = []
+        for node, target in nodes:
+            inside = False
+            for n in range(int((jd_end - jd_start) / (10 * MINUTE)) + 1):
+                jd = jd_start + n * 10 * MINUTE
+                now = abs(ascendant_table.wrap180(asc_tropical(jd, lat, lon) - target(jd))) <= WINDOW_ORB
+                if now and not inside and n > 0:
+                    events.append(Event(jd, f"{node} enter"))
+                elif inside and not now:
+                    events.append(Event(jd - 10 * MINUTE, f"{node} exit"))
+                inside = now
+        return events
+
+    def table():
+        events = []
+        for node, target in nodes:
+            for jd_in, jd_out in ascendant_table.find_windows(jd_start, jd_end, lat, lon, target, WINDOW_ORB):
+                # Windows are clipped to the range; clipped edges are not events
+                if jd_in > jd_start:
+                    events.append(Event(jd_in, f"{node} enter"))
+                if jd_out < jd_end:
+                    events.append(Event(jd_out, f"{node} exit"))
+        return events
+
+    return reference, [
+        ('10-minute grid', grid_scan),
+        ('ascendant table windows', table),
+    ]
+
+
+def aspect_pairs():
+    pairs = []
+    labels = []
+    for i, j, angle in ASPECTS:
+        for pair in crossings.aspect_pairs(i, j, angle):
+            pairs.append(pair)
+            labels.append(f"{ASPECT_BODIES[i][0]}-{ASPECT_BODIES[j][0]} {pair.target:+.0f}")
+    pairs.append(crossings.Pair(INGRESS_BODY, None, 0.0, 30.0))
+    labels.append(f"{ASPECT_BODIES[INGRESS_BODY][0]} ingress")
+    return pairs, labels
+
+
+def aspects_case():
+    jd_start, jd_end = julday_range(ASPECT_RANGE)
+    swe.set_sid_mode(AYANAMSA, 0, 0)
+    pairs, labels = aspect_pairs()
+    precise = longitudes_reader(ephemeris.get_provider(), ASPECT_BODIES)
+
+    def reference():
+        functions = {}
+        for pair, label in zip(pairs, labels):
+            def f(jd, pair=pair):
+                lons = precise(jd)
+                reference_lon = lons[pair.j] if pair.j is not None else 0.0
+                return crossings.wrap(lons[pair.i] - reference_lon - pair.target, pair.period) * (360.0 / pair.period)
+            functions[label] = f
+        return scan_compare.dense_crossings(jd_start, jd_end, 10 * MINUTE, functions)
+
+    def detector(step_minutes, longitudes_at):
+        def run():
+            step = step_minutes * MINUTE
+            jds = [jd_start + n * step for n in range(int((jd_end - jd_start) / step + 1e-9) + 1)]
+            return [Event(e.jd, labels[e.pair]) for e in crossings.scan(jds, longitudes_at, pairs)]
+        return run
+
+    fast = longitudes_reader(ephemeris.EphemerisProvider(mode='fast'), ASPECT_BODIES)
+    return reference, [
+        ('detector, 1 h steps', detector(60, precise)),
+        ('detector, 6 h steps', detector(360, precise)),
+        ('detector, 1 day steps', detector(1440, precise)),
+        ('detector, 1 h, fast ephemeris', detector(60, fast)),
+    ]
+
+
+def clusters_case():
+    jd_start, jd_end = julday_range(CLUSTER_RANGE)
+    swe.set_sid_mode(AYANAMSA, 0, 0)
+    longitudes_at = longitudes_reader(ephemeris.get_provider(), CLUSTER_BODIES)
+    names = [name for name, _ in CLUSTER_BODIES]
+
+    def reference():
+        # Brute force over every subset on an hourly grid, changes bisected
+        return scan_compare.dense_clusters(jd_start, jd_end, 60 * MINUTE, longitudes_at,
+                                           CLUSTER_ORB, CLUSTER_MIN, names)
+
+    def sweep(step_minutes):
+        def run():
+            events = []
+            for members, jd_enter, jd_exit in clusters.scan_clusters(
+                    jd_start, jd_end, step_minutes * MINUTE, longitudes_at, CLUSTER_ORB, CLUSTER_MIN):
+                if jd_enter > jd_start:
+                    events.append(Event(jd_enter, scan_compare.cluster_label('enter', members, names)))
+                if jd_exit is not None:
+                    events.append(Event(jd_exit, scan_compare.cluster_label('exit', members, names)))
+            return events
+        return run
+
+    return reference, [
+        ('sorted sweep, 1 h steps', sweep(60)),
+        ('sorted sweep, 1 day steps', sweep(1440)),
+    ]
+
+
+CASES = {
+    'crossings': crossings_case,
+    'windows': windows_case,
+    'aspects': aspects_case,
+    'clusters': clusters_case,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        sys.exit(f"Unknown case(s): {', '.join(unknown)}; choose from {', '.join(CASES)}")
+
+    provider = ephemeris.get_provider()
+
+    reports = []
+    for name in names:
+        reference, strategies = CASES[name]()
+        reports.extend(scan_compare.compare(name, reference, strategies, TOLERANCES[name]))
+        print(f"{name}: done", file=sys.stderr)
+
+    print(scan_compare.format_reports(reports))
+    rejected = [f"{r.case} / {r.strategy}" for r in reports if not scan_compare.accepted(r)]
+    if rejected:
+        print("\nNot matching the reference within tolerance: " + ', '.join(rejected))
+
+    # Which ephemeris backend served each body (warns about Moshier fallback)
+    print(provider.report())
@@ -0,0 +1,107 @@
+from collections import namedtuple
+
+
+# Streaming crossing detector shared by the scanners. Samples arrive in
+# chunks of (jd, longitudes); for every watched pair the wrapped difference
+#     wrap(lon[i] - lon[j] - target)   (lon[j] taken as 0 when j is None)
+# is computed for the whole chunk at once (plain Python list passes, the
+# repo has no numpy) and each sign change is reported with a linearly
+# interpolated time. The last sample of a chunk is carried over, so
+# crossings that fall between two chunks are not lost.
+
+# i, j: longitude columns (j=None compares against 0°); target: angle in
+# degrees; period: wrap period, e.g. 360 for aspects, or the step angle to
+# catch every multiple of it (30 for sign ingresses)
+Pair = namedtuple('Pair', ['i', 'j', 'target', 'period'], defaults=(None, 0.0, 360.0))
+
+# jd: interpolated time; pair: index into the detector's pairs; multiple:
+# which multiple of the period was crossed (0 for plain aspects);
+# longitudes: interpolated longitudes of all columns at jd
+Crossing = namedtuple('Crossing', ['jd', 'pair', 'multiple', 'longitudes'])
+
+
+LONGITUDE_EPSILON = 1e-9  # interpolated longitudes this close to 360° become 0°
+
+
+def wrap(value, period=360.0):
+    # Wrap into [-period/2, period/2)
+    half = period / 2.0
+    return (value + half) % period - half
+
+
+def aspect_pairs(i, j, angle):
+    # Pairs that fire when the separation of i and j (0..180°) crosses angle.
+    # Separation == angle means lon_i - lon_j == +angle or -angle.
+    angle = abs(angle) % 360.0
+    if angle % 180.0 == 0:
+        return [Pair(i, j, angle)]
+    return [Pair(i, j, angle), Pair(i, j, -angle)]
+
+
+class CrossingDetector:
+    def __init__(self, pairs):
+        self.pairs = list(pairs)
+        self._last_jd = None
+        self._last_row = None
+
+    def reset(self):
+        self._last_jd = self._last_row = None
+
+    def _values(self, rows, pair):
+        # Wrapped differences for one pair over a whole chunk
+        i, j, target, period = pair
+        half = period / 2.0
+        if j is None:
+            return [(row[i] - target + half) % period - half for row in rows]
+        return [(row[i] - row[j] - target + half) % period - half for row in rows]
+
+    def feed(self, jds, rows):
+        # jds: increasing julian days; rows: one list of longitudes per jd.
+        # Returns the crossings inside this chunk (and since the previous
+        # chunk), sorted by time.
+        if not jds:
+            return []
+        if self._last_jd is not None:
+            jds = [self._last_jd] + list(jds)
+            rows = [self._last_row] + list(rows)
+        events = []
+        for p, pair in enumerate(self.pairs):
+            values = self._values(rows, pair)
+            half = pair.period / 2.0
+            for k, (a, b) in enumerate(zip(values, values[1:])):
+                # A jump of about a full period is the wrap point, not a crossing
+                if (a < 0.0) != (b < 0.0) and abs(b - a) < half:
+                    frac = a / (a - b)
+                    events.append(self._crossing(jds, rows, k, frac, p, pair))
+        self._last_jd = jds[-1]
+        self._last_row = rows[-1]
+        events.sort(key=lambda e: e.jd)
+        return events
+
+    def _crossing(self, jds, rows, k, frac, p, pair):
+        jd = jds[k] + (jds[k + 1] - jds[k]) * frac
+        longitudes = []
+        for before, after in zip(rows[k], rows[k + 1]):
+            lon = (before + wrap(after - before) * frac) % 360.0
+            # A crossing at 0° can come out as 359.99999... after the modulo
+            if lon > 360.0 - LONGITUDE_EPSILON:
+                lon = 0.0
+            longitudes.append(lon)
+        reference = longitudes[pair.j] if pair.j is not None else 0.0
+        count = max(1, int(round(360.0 / pair.period)))
+        multiple = int(round(((longitudes[pair.i] - reference - pair.target) % 360.0) / pair.period)) % count
+        return Crossing(jd, p, multiple, longitudes)
+
+
+def scan(jds, longitudes_at, pairs, chunk_size=512):
+    # Convenience driver: evaluate longitudes_at(jd) over jds in chunks and
+    # yield crossings as they are found
+    detector = CrossingDetector(pairs)
+    chunk = []
+    for jd in jds:
+        chunk.append(jd)
+        if len(chunk) == chunk_size:
+            yield from detector.feed(chunk, [longitudes_at(t) for t in chunk])
+            chunk = []
+    if chunk:
+        yield from detector.feed(chunk, [longitudes_at(t) for t in chunk])
@@ -0,0 +1,195 @@
+import math
+from collections import namedtuple
+from datetime import timedelta
+
+from lazy_import import LazyModule
+from sidereal import sidereal_longitudes
+
+swe = LazyModule('swisseph')
+
+
+# "Sample at local clock time each day" mode of python-tinker-new.py, done
+# in batches: the UT julian days for every day / local time / location are
+# generated arithmetically, each body is evaluated once per distinct UT
+# sample as a column (slow bodies interpolated from a coarse grid), and the
+# threshold and separation filters run as single passes over the whole
+# series instead of inside the day loop.
+
+Location = namedtuple('Location', ['name', 'latitude', 'longitude', 'timezone_offset'])
+
+# One kept sample: location, local date, (hour, minute), UT julian day and the
+# sidereal longitudes of the requested bodies
+Snapshot = namedtuple('Snapshot', ['location', 'date', 'local_time', 'jd', 'longitudes'])
+
+SEPARATION_TOLERANCE = 1.0  # two bodies: keep samples within 1° of the angle
+
+# Coarse grid (days) for bodies smooth enough to interpolate, keyed by
+# Swiss Ephemeris ids; keeps the error around 1e-4° or less
+INTERPOLATION_STEP_DAYS = {
+    0: 4.0,    # Sun
+    3: 1.0,    # Venus
+    4: 2.0,    # Mars
+    5: 4.0,    # Jupiter
+    6: 8.0,    # Saturn
+    7: 8.0,    # Uranus
+    8: 8.0,    # Neptune
+    9: 8.0,    # Pluto
+    10: 16.0,  # Mean Node
+    "Ketu": 16.0,
+}
+
+
+def parse_times(text):
+    # "12:00, 18:30" -> [(12, 0), (18, 30)]
+    times = []
+    for part in text.replace(';', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        hour, _, minute = part.partition(':')
+        times.append((int(hour), int(minute or 0)))
+    return times
+
+
+def sample_times(start_date, end_date, local_times, timezone_offset):
+    # (date, (hour, minute), jd) for every day and local time, in time order
+    jd0 = swe.julday(start_date.year, start_date.month, start_date.day, 0.0)
+    times = sorted(local_times)
+    samples = []
+    for k in range((end_date - start_date).days + 1):
+        date = start_date + timedelta(days=k)
+        for hour, minute in times:
+            samples.append((date, (hour, minute), jd0 + k + (hour + minute / 60.0 - timezone_offset) / 24.0))
+    return samples
+
+
+def interpolate(jds, step, values_at):
+    # values_at(jd) on the coarse grid jds[0] + k * step (one point either
+    # side as margin), then 4-point Lagrange interpolation at every jd.
+    # jds must be sorted; longitudes are unwrapped across 0/360 first.
+    first = jds[0] - step
+    count = int((jds[-1] - first) / step) + 3
+    grid = values_at([first + k * step for k in range(count)])
+    for k in range(1, count):
+        grid[k] += round((grid[k - 1] - grid[k]) / 360.0) * 360.0
+    out = []
+    for jd in jds:
+        x = (jd - first) / step
+        k = min(max(int(x), 1), count - 3)
+        c0, c1, c2, c3 = _cubic(*grid[k - 1:k + 3])
+        u = x - k
+        out.append((c0 + u * (c1 + u * (c2 + u * c3))) % 360.0)
+    return out
+
+
+def _cubic(a, b, c, d):
+    # Coefficients (u^0 .. u^3) of the Lagrange cubic through a, b, c, d
+    # (unwrapped) at u = -1, 0, 1, 2
+    return (b, -a / 3 - b / 2 + c - d / 6, a / 2 - b + c / 2, (d - a) / 6 + (b - c) / 2)
+
+
+class GridInterpolator:
+    # A longitude at any jd, interpolated as in interpolate() from
+    # value_at(jd) on the grid origin + k * step. Grid points and the cubic
+    # of each grid interval are computed on first use and kept, for scans
+    # that sample many times per interval and bisect between their samples.
+    def __init__(self, value_at, origin, step):
+        self.value_at = value_at
+        self.origin = origin
+        self.step = step
+        self.grid = {}
+        self.cubics = {}
+
+    def _point(self, k):
+        value = self.grid.get(k)
+        if value is None:
+            value = self.grid[k] = self.value_at(self.origin + k * self.step)
+        return value
+
+    def _interval(self, k):
+        values = [self._point(k + n) for n in (-1, 0, 1, 2)]
+        for n in range(1, 4):
+            values[n] += round((values[n - 1] - values[n]) / 360.0) * 360.0
+        cubic = self.cubics[k] = _cubic(*values)
+        return cubic
+
+    def __call__(self, jd):
+        x = (jd - self.origin) / self.step
+        k = math.floor(x)
+        c0, c1, c2, c3 = self.cubics.get(k) or self._interval(k)
+        u = x - k
+        return (c0 + u * (c1 + u * (c2 + u * c3))) % 360.0
+
+
+def evaluate(jds, bodies, ayanamsa_type, latitude=None, longitude=None):
+    # Sidereal longitudes of each body at every (sorted) jd, one list
+    # (column) per body. Slow bodies are interpolated from a coarse grid when
+    # the samples are denser than it; the Moon, Mercury, the True Node and
+    # the Ascendant are always computed at every sample.
+    columns = []
+    spacing = (jds[-1] - jds[0]) / (len(jds) - 1) if len(jds) > 1 else 0.0
+    for body in bodies:
+        def values_at(times, body=body):
+            return sidereal_longitudes(times, body, ayanamsa_type, latitude, longitude)
+        step = INTERPOLATION_STEP_DAYS.get(body)
+        if step and spacing and spacing < step:
+            columns.append(interpolate(jds, step, values_at))
+        else:
+            columns.append(values_at(jds))
+    return columns
+
+
+def threshold_indexes(values, angle):
+    # Samples where the longitude has moved at least angle since the last
+    # kept sample; the first sample is always kept
+    if not values:
+        return []
+    keep = [0]
+    last = values[0]
+    for k in range(1, len(values)):
+        if abs(values[k] - last) >= angle:
+            keep.append(k)
+            last = values[k]
+    return keep
+
+
+def separation_indexes(first, second, angle, tolerance=SEPARATION_TOLERANCE):
+    # Samples where the separation of two bodies is within tolerance of angle
+    keep = []
+    for k, (a, b) in enumerate(zip(first, second)):
+        diff = abs(a - b)
+        if abs(min(diff, 360 - diff) - angle) < tolerance:
+            keep.append(k)
+    return keep
+
+
+def snapshot(start_date, end_date, local_times, locations, bodies, ayanamsa_type, angle):
+    # Kept samples for every location, each location in time order. One body:
+    # keep when it moved at least angle; two or more: when the first two are
+    # within 1° of angle apart.
+    samples_by_location = [sample_times(start_date, end_date, local_times, loc.timezone_offset)
+                           for loc in locations]
+
+    # Only the Ascendant depends on the location; everything else is
+    # evaluated once per distinct UT sample and shared
+    shared_bodies = [b for b in dict.fromkeys(bodies) if b != "ASC"]
+    jds = sorted({jd for samples in samples_by_location for _, _, jd in samples})
+    shared = {}
+    for body, column in zip(shared_bodies, evaluate(jds, shared_bodies, ayanamsa_type)):
+        shared[body] = dict(zip(jds, column))
+
+    results = []
+    for loc, samples in zip(locations, samples_by_location):
+        loc_jds = [jd for _, _, jd in samples]
+        asc = None
+        if "ASC" in bodies:
+            asc = evaluate(loc_jds, ["ASC"], ayanamsa_type, loc.latitude, loc.longitude)[0]
+        columns = [asc if b == "ASC" else [shared[b][jd] for jd in loc_jds] for b in bodies]
+        if len(columns) == 1:
+            keep = threshold_indexes(columns[0], angle)
+        else:
+            keep = separation_indexes(columns[0], columns[1], angle)
+        for k in keep:
+            date, local_time, jd = samples[k]
+            results.append(Snapshot(loc, date, local_time, jd, [column[k] for column in columns]))
+    return results
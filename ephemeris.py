@@ -0,0 +1,272 @@
+import os
+import math
+import mmap
+import configparser
+from collections import Counter, defaultdict
+
+from lazy_import import LazyModule
+
+swe = LazyModule('swisseph')
+
+
+# Ephemeris configuration is looked up in this order:
+#   1. arguments passed to get_provider()/EphemerisProvider()
+#   2. environment variables SWISSEPH_EPHE_PATH / SWISSEPH_EPHE_MODE
+#   3. ephemeris.ini next to the scripts, e.g.
+#        [ephemeris]
+#        path = N:\swisseph\ephe
+#        mode = precise
+#   4. the defaults below
+EPHE_PATH_ENV = 'SWISSEPH_EPHE_PATH'
+EPHE_MODE_ENV = 'SWISSEPH_EPHE_MODE'
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ephemeris.ini')
+
+# Windows: r'C:\path\to\ephe', MacOS/Linux: adjust path as needed
+if os.name == 'nt':
+    DEFAULT_EPHE_PATH = r'N:\swisseph\ephe'
+else:
+    DEFAULT_EPHE_PATH = os.path.expanduser('~/repos/personal/swisseph/ephe')
+
+# precise: Swiss Ephemeris files, Moshier only if files are missing (reported)
+# moshier: always use the built-in Moshier ephemeris, no files needed
+# fast:    cached Chebyshev fits of the longitude, built from the files
+MODES = ('precise', 'moshier', 'fast')
+DEFAULT_MODE = 'precise'
+
+# Chebyshev segment length (days) per body; fast movers need short segments
+CHEBYSHEV_DEGREE = 12
+# (keyed by Swiss Ephemeris body ids so swisseph is not needed at import)
+CHEBYSHEV_SEGMENT_DAYS = {
+    1: 2.0,    # Moon
+    0: 16.0,   # Sun
+    2: 8.0,    # Mercury
+    3: 16.0,   # Venus
+    4: 16.0,   # Mars
+    11: 1.0,   # True Node, wobbles with a period of about two weeks
+}
+DEFAULT_SEGMENT_DAYS = 64.0
+
+# Bodies computed from formulas, without ephemeris files
+ANALYTIC_BODIES = {
+    10,  # Mean Node
+    12,  # Mean Apogee (Lilith)
+}
+# A fit costs CHEBYSHEV_DEGREE + 1 ephemeris calls; segments are only fitted
+# when the body is sampled densely enough for at least this many times that
+# per segment. Sparser sampling (one Moon position per day, say) is served
+# straight from the ephemeris.
+FIT_PAYBACK = 2
+
+# .se1 file prefixes: planets, moon, main asteroids
+EPHE_FILE_PREFIXES = {
+    'planets': 'sepl',
+    'moon': 'semo',
+    'asteroids': 'seas',
+}
+EPHE_FILE_YEARS = 600  # each .se1 file covers 600 years
+
+
+def read_config(config_file=CONFIG_FILE):
+    # Returns (path, mode) from the ini file, either may be None
+    if not config_file or not os.path.exists(config_file):
+        return None, None
+    parser = configparser.ConfigParser()
+    parser.read(config_file, encoding='utf-8')
+    if not parser.has_section('ephemeris'):
+        return None, None
+    return parser.get('ephemeris', 'path', fallback=None), parser.get('ephemeris', 'mode', fallback=None)
+
+
+def ephe_file_names(jd_start, jd_end, kinds=('planets', 'moon')):
+    # Names of the .se1 files that cover the given julian day range
+    year_start = swe.revjul(min(jd_start, jd_end))[0]
+    year_end = swe.revjul(max(jd_start, jd_end))[0]
+    names = []
+    block = (year_start // EPHE_FILE_YEARS) * EPHE_FILE_YEARS
+    while block <= year_end:
+        century = block // 100
+        sign = 'm' if century < 0 else '_'
+        for kind in kinds:
+            names.append(f"{EPHE_FILE_PREFIXES[kind]}{sign}{abs(century):02d}.se1")
+        block += EPHE_FILE_YEARS
+    return names
+
+
+def backend_name(retflag, body=None):
+    # Map the flags returned by swe.calc_ut to the backend that actually served.
+    # Mean node / apogee are formulas: swe keeps FLG_SWIEPH in retflag for
+    # them even when no files exist, so the flag says nothing about files.
+    if body in ANALYTIC_BODIES:
+        return 'analytic'
+    if retflag & swe.FLG_SWIEPH:
+        return 'SWIEPH'
+    if retflag & swe.FLG_JPLEPH:
+        return 'JPL'
+    return 'Moshier'
+
+
+def body_name(body):
+    if isinstance(body, int):
+        return swe.get_planet_name(body)
+    return str(body)
+
+
+def _chebyshev_fit(values):
+    # Coefficients for samples taken at the Chebyshev nodes of [-1, 1]
+    n = len(values)
+    coeffs = []
+    for j in range(n):
+        total = 0.0
+        for k, v in enumerate(values):
+            total += v * _cos(j * (k + 0.5) / n)
+        coeffs.append(2.0 * total / n)
+    coeffs[0] /= 2.0
+    return coeffs
+
+
+def _chebyshev_eval(coeffs, x):
+    # Clenshaw recurrence
+    b1 = b2 = 0.0
+    for c in reversed(coeffs[1:]):
+        b1, b2 = 2.0 * x * b1 - b2 + c, b1
+    return x * b1 - b2 + coeffs[0]
+
+
+def _cos(fraction_of_pi):
+    return math.cos(math.pi * fraction_of_pi)
+
+
+class EphemerisProvider:
+    def __init__(self, ephe_path=None, mode=None, config_file=CONFIG_FILE):
+        cfg_path, cfg_mode = read_config(config_file)
+        self.ephe_path = ephe_path or os.environ.get(EPHE_PATH_ENV) or cfg_path or DEFAULT_EPHE_PATH
+        self.mode = (mode or os.environ.get(EPHE_MODE_ENV) or cfg_mode or DEFAULT_MODE).lower()
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown ephemeris mode '{self.mode}', expected one of {', '.join(MODES)}")
+
+        self.backends = defaultdict(Counter)  # body -> Counter of backend names
+        self.missing_files = []
+        self._mapped = {}  # file name -> (file object, mmap)
+        self._segments = {}  # (body, flags, ayanamsa, index) -> chebyshev coeffs
+        self._last_jd = {}  # (body, flags) -> previous jd, gives the sampling density
+        swe.set_ephe_path(self.ephe_path)
+
+    @property
+    def base_flag(self):
+        return swe.FLG_MOSEPH if self.mode == 'moshier' else swe.FLG_SWIEPH
+
+    def _record(self, body, backend):
+        self.backends[body][backend] += 1
+
+    def calc_ut(self, jd, body, flags=0):
+        # Same return value as swe.calc_ut, ephemeris flag chosen by the mode
+        flags = (flags & ~(swe.FLG_SWIEPH | swe.FLG_MOSEPH | swe.FLG_JPLEPH)) | self.base_flag
+        result = swe.calc_ut(jd, body, flags)
+        self._record(body, backend_name(result[1], body))
+        return result
+
+    def longitude(self, jd, body, flags=0):
+        # Ecliptic longitude in degrees; served from the Chebyshev cache in fast mode
+        if self.mode != 'fast':
+            return float(self.calc_ut(jd, body, flags)[0][0])
+        return self._cached_longitude(jd, body, flags)
+
+    def _cached_longitude(self, jd, body, flags):
+        seg_days = CHEBYSHEV_SEGMENT_DAYS.get(body, DEFAULT_SEGMENT_DAYS)
+        last = self._last_jd.get((body, flags))
+        self._last_jd[(body, flags)] = jd
+        spacing = abs(jd - last) if last is not None else seg_days
+        if spacing * FIT_PAYBACK * (CHEBYSHEV_DEGREE + 1) > seg_days:
+            # Too sparse for a fit to pay off
+            return float(self.calc_ut(jd, body, flags)[0][0])
+        index = int((jd - 2451545.0) // seg_days)
+        seg_start = 2451545.0 + index * seg_days
+        # Sidereal fits depend on the active ayanamsa, key on its value
+        ayanamsa = round(swe.get_ayanamsa_ut(seg_start), 9) if flags & swe.FLG_SIDEREAL else None
+        key = (body, flags, ayanamsa, index)
+        segment = self._segments.get(key)
+        if segment is None:
+            segment = self._fit_segment(body, flags, seg_start, seg_days)
+            self._segments[key] = segment
+        x = 2.0 * (jd - seg_start) / seg_days - 1.0
+        self._record(body, 'Chebyshev')
+        return _chebyshev_eval(segment, x) % 360.0
+
+    def _fit_segment(self, body, flags, seg_start, seg_days):
+        n = CHEBYSHEV_DEGREE + 1
+        samples = []
+        prev = None
+        for k in range(n):
+            # Nodes ordered from x=1 down to x=-1
+            x = _cos((k + 0.5) / n)
+            jd = seg_start + (x + 1.0) * seg_days / 2.0
+            lon = float(self.calc_ut(jd, body, flags)[0][0])
+            # Unwrap across 0/360 so the fitted curve is continuous
+            if prev is not None:
+                while lon - prev > 180.0:
+                    lon -= 360.0
+                while lon - prev < -180.0:
+                    lon += 360.0
+            samples.append(lon)
+            prev = lon
+        return _chebyshev_fit(samples)
+
+    def preload(self, jd_start, jd_end, bodies=(), kinds=('planets', 'moon')):
+        # Memory-map the .se1 files needed for the range and touch every page
+        # so later reads are served from the page cache; then open them in swe.
+        if self.mode == 'moshier':
+            return []
+        loaded = []
+        for name in ephe_file_names(jd_start, jd_end, kinds):
+            if name in self._mapped:
+                loaded.append(name)
+                continue
+            path = os.path.join(self.ephe_path, name)
+            if not os.path.exists(path):
+                if name not in self.missing_files:
+                    self.missing_files.append(name)
+                continue
+            f = open(path, 'rb')
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            for offset in range(0, len(mm), mmap.PAGESIZE):
+                mm[offset]
+            self._mapped[name] = (f, mm)
+            loaded.append(name)
+        for body in bodies:
+            self.calc_ut(jd_start, body)
+        return loaded
+
+    def close(self):
+        for f, mm in self._mapped.values():
+            mm.close()
+            f.close()
+        self._mapped.clear()
+
+    def report(self):
+        # One line per body: which backend(s) served it and how often
+        lines = [f"Ephemeris mode: {self.mode}, path: {self.ephe_path}"]
+        for body, counts in self.backends.items():
+            used = ', '.join(f"{name} x{count}" for name, count in counts.most_common())
+            lines.append(f"  {body_name(body)}: {used}")
+        if self.missing_files:
+            lines.append(f"  Missing ephemeris files: {', '.join(self.missing_files)}")
+        return '\n'.join(lines)
+
+    def fallbacks(self):
+        # Bodies that were requested from files but served by Moshier
+        if self.mode == 'moshier':
+            return []
+        return [body for body, counts in self.backends.items() if counts.get('Moshier')]
+
+
+_provider = None
+
+
+def get_provider(ephe_path=None, mode=None):
+    # Shared provider for the scripts; rebuilt when called with new settings
+    global _provider
+    if _provider is None or ephe_path is not None or mode is not None:
+        if _provider is not None:
+            _provider.close()
+        _provider = EphemerisProvider(ephe_path, mode)
+    return _provider
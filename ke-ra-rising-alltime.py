@@ -1,10 +1,9 @@
+import math
 import swisseph as swe
+import ephemeris
+import ascendant_table
+from sidereal import rahu_longitude, ketu_longitude
 from datetime import datetime, timedelta, timezone
-import pytz
-from tabulate import tabulate
-
-# Set path to ephemeris files (adjust if needed)
-swe.set_ephe_path(r'N:\swisseph\ephe')
 
 # # Location (example: Delhi)
 # lat, lon = 28.6139, 77.2090
@@ -19,63 +18,57 @@ end = datetime(2025, 6, 30, 23, 59, tzinfo=timezone.utc)
 
 # Timezones to display
 zones = {
-    'London': pytz.timezone('Europe/London'),
-    'Chicago': pytz.timezone('America/Chicago'),
-    'Sydney': pytz.timezone('Australia/Sydney'),
-    'India': pytz.timezone('Asia/Kolkata')
+    'London': 'Europe/London',
+    'Chicago': 'America/Chicago',
+    'Sydney': 'Australia/Sydney',
+    'India': 'Asia/Kolkata'
 }
 
-# Get Lahiri ayanamsha (Vedic)
-def get_ayanamsha(jd):
-    return swe.get_ayanamsa(jd)
+if __name__ == "__main__":
+    # Timezone database and table formatting are only loaded when run
+    import pytz
+    from tabulate import tabulate
+
+    # Ephemeris path/mode come from SWISSEPH_EPHE_PATH / SWISSEPH_EPHE_MODE or ephemeris.ini
+    provider = ephemeris.get_provider()
 
-# Convert tropical longitude to sidereal
-def sidereal_longitude(tropical_long, jd):
-    ayan = get_ayanamsha(jd)
-    sidereal = tropical_long - ayan
-    if sidereal < 0:
-        sidereal += 360
-    return sidereal
+    step = timedelta(minutes=10)
+    steps_per_day = timedelta(days=1) / step
+    jd_start = swe.julday(start.year, start.month, start.day, start.hour + start.minute/60)
+    jd_end = swe.julday(end.year, end.month, end.day, end.hour + end.minute/60)
 
-# Check if two angles are within orb degrees (default 1°)
-def is_within_orb(angle1, angle2, orb=1.0):
-    diff = abs(angle1 - angle2)
-    diff = min(diff, 360 - diff)
-    return diff <= orb
+    # Map the ephemeris files for the scanned range before the loop
+    provider.preload(jd_start, jd_end, bodies=(swe.MEAN_NODE,))
 
-# Loop through the month in 10-minute steps
-current = start
-results = []
+    # The Ascendant is within 1° of a node during short windows found from the
+    # per-latitude lookup table; list the 10-minute steps that fall inside them
+    results = []
+    for node, target in (('Rahu', rahu_longitude), ('Ketu', ketu_longitude)):
+        for jd_in, jd_out in ascendant_table.find_windows(jd_start, jd_end, lat, lon, target, orb=1.0):
+            first = math.ceil((jd_in - jd_start) * steps_per_day)
+            last = math.floor((jd_out - jd_start) * steps_per_day)
+            for k in range(first, last + 1):
+                current = start + k * step
+                results.append((current, node))
+    results.sort(key=lambda x: x[0])
 
-while current <= end:
-    jd = swe.julday(current.year, current.month, current.day, current.hour + current.minute/60)
-    cusps, ascmc = swe.houses(jd, lat, lon, b'P')
-    asc_tropical = ascmc[0]
-    asc_sidereal = sidereal_longitude(asc_tropical, jd)
-    rahu_tropical, _ = swe.calc_ut(jd, swe.MEAN_NODE)
-    rahu_long = rahu_tropical[0]
-    rahu_sidereal = sidereal_longitude(rahu_long, jd)
-    ketu_sidereal = (rahu_sidereal + 180) % 360
-    if is_within_orb(asc_sidereal, rahu_sidereal):
-        results.append((current, 'Rahu'))
-    if is_within_orb(asc_sidereal, ketu_sidereal):
-        results.append((current, 'Ketu'))
-    current += timedelta(minutes=10)
+    # Convert UTC datetime to all specified timezones and prepare table rows
+    table_rows = []
+    for dt, node in results:
+        row = [
+            dt.strftime('%Y-%m-%d %H:%M UTC'),
+            node
+        ]
+        for zone_name, tz in zones.items():
+            local_dt = dt.astimezone(pytz.timezone(tz))
+            row.append(local_dt.strftime('%Y-%m-%d %H:%M %Z'))
+        table_rows.append(row)
 
-# Convert UTC datetime to all specified timezones and prepare table rows
-table_rows = []
-for dt, node in results:
-    row = [
-        dt.strftime('%Y-%m-%d %H:%M UTC'),
-        node
-    ]
-    for zone_name, tz in zones.items():
-        local_dt = dt.astimezone(tz)
-        row.append(local_dt.strftime('%Y-%m-%d %H:%M %Z'))
-    table_rows.append(row)
+    # Table headers
+    headers = ['UTC', 'Node'] + list(zones.keys())
 
-# Table headers
-headers = ['UTC', 'Node'] + list(zones.keys())
+    # Display as table (all rows)
+    print(tabulate(table_rows, headers=headers, tablefmt='grid'))
 
-# Display as table (all rows)
-print(tabulate(table_rows, headers=headers, tablefmt='grid'))
+    # Which ephemeris backend served each body (warns about Moshier fallback)
+    print(provider.report())
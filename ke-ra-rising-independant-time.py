@@ -1,85 +1,52 @@
 import swisseph as swe
+import ephemeris
+import ascendant_table
+from sidereal import rahu_longitude, ketu_longitude
 from datetime import datetime, timedelta, timezone
-import pytz
-from tabulate import tabulate
-
-# Set ephemeris path
-swe.set_ephe_path(r'N:\swisseph\ephe')
 
 # Define locations with lat, lon, and timezone
 locations = {
-    'London': {'lat': 51.5074, 'lon': -0.1278, 'tz': pytz.timezone('Europe/London')},
-    'Chicago': {'lat': 41.8781, 'lon': -87.6298, 'tz': pytz.timezone('America/Chicago')},
-    'Sydney': {'lat': -33.8688, 'lon': 151.2093, 'tz': pytz.timezone('Australia/Sydney')},
-    'India': {'lat': 28.6139, 'lon': 77.2090, 'tz': pytz.timezone('Asia/Kolkata')}
+    'London': {'lat': 51.5074, 'lon': -0.1278, 'tz': 'Europe/London'},
+    'Chicago': {'lat': 41.8781, 'lon': -87.6298, 'tz': 'America/Chicago'},
+    'Sydney': {'lat': -33.8688, 'lon': 151.2093, 'tz': 'Australia/Sydney'},
+    'India': {'lat': 28.6139, 'lon': 77.2090, 'tz': 'Asia/Kolkata'}
 }
 
 # Define UTC start and end datetime
 start = datetime(2025, 5, 1, 0, 0, tzinfo=timezone.utc)
 end = datetime(2025, 7, 10, 23, 59, tzinfo=timezone.utc)
 
-def get_ayanamsha(jd):
-    return swe.get_ayanamsa(jd)
-
-def sidereal_longitude(tropical_long, jd):
-    ayan = get_ayanamsha(jd)
-    sidereal = tropical_long - ayan
-    if sidereal < 0:
-        sidereal += 360
-    return sidereal
-
-def angle_diff(a, b):
-    diff = a - b
-    while diff < -180:
-        diff += 360
-    while diff > 180:
-        diff -= 360
-    return diff
+if __name__ == "__main__":
+    # Timezone database and table formatting are only loaded when run
+    import pytz
+    from tabulate import tabulate
 
-results = []
+    # Ephemeris path/mode come from SWISSEPH_EPHE_PATH / SWISSEPH_EPHE_MODE or ephemeris.ini
+    provider = ephemeris.get_provider()
 
-for loc_name, loc in locations.items():
-    prev_asc = None
-    prev_rahu = None
-    prev_ketu = None
-    prev_time = None
-    last_node = None  # Track last node detected to ensure alternation
-    current = start
-    while current <= end:
-        jd = swe.julday(current.year, current.month, current.day, current.hour + current.minute/60)
-        rahu_tropical, _ = swe.calc_ut(jd, swe.MEAN_NODE)
-        rahu_long = rahu_tropical[0]
-        rahu_sidereal = sidereal_longitude(rahu_long, jd)
-        ketu_sidereal = (rahu_sidereal + 180) % 360
+    jd_start = swe.julday(start.year, start.month, start.day, start.hour + start.minute/60)
+    jd_end = swe.julday(end.year, end.month, end.day, end.hour + end.minute/60)
 
-        cusps, ascmc = swe.houses(jd, loc['lat'], loc['lon'], b'P')
-        asc_tropical = ascmc[0]
-        asc_sidereal = sidereal_longitude(asc_tropical, jd)
+    # Map the ephemeris files for the scanned range before the loop
+    provider.preload(jd_start, jd_end, bodies=(swe.MEAN_NODE,))
 
-        if prev_asc is not None:
-            # Rahu crossing
-            rahu_cross = (angle_diff(prev_asc, prev_rahu) * angle_diff(asc_sidereal, rahu_sidereal) < 0)
-            # Ketu crossing
-            ketu_cross = (angle_diff(prev_asc, prev_ketu) * angle_diff(asc_sidereal, ketu_sidereal) < 0)
+    results = []
 
-            # Only record a crossing if it's not the same as the last detected node
-            if rahu_cross and last_node != 'Rahu':
-                local_time = current.astimezone(loc['tz'])
-                results.append([loc_name, local_time.strftime('%Y-%m-%d %H:%M %Z'), 'Rahu'])
-                last_node = 'Rahu'
-            elif ketu_cross and last_node != 'Ketu':
-                local_time = current.astimezone(loc['tz'])
-                results.append([loc_name, local_time.strftime('%Y-%m-%d %H:%M %Z'), 'Ketu'])
-                last_node = 'Ketu'
+    # Ascendant crossings come from the per-latitude lookup table, a handful of
+    # ephemeris calls per event instead of one swe.houses call per minute
+    for loc_name, loc in locations.items():
+        for node, target in (('Rahu', rahu_longitude), ('Ketu', ketu_longitude)):
+            for jd in ascendant_table.find_crossings(jd_start, jd_end, loc['lat'], loc['lon'], target):
+                # Report the first whole minute after the crossing
+                event = ascendant_table.jd_to_datetime(jd).replace(second=0, microsecond=0) + timedelta(minutes=1)
+                local_time = event.astimezone(pytz.timezone(loc['tz']))
+                results.append([loc_name, local_time.strftime('%Y-%m-%d %H:%M %Z'), node])
 
-        prev_asc = asc_sidereal
-        prev_rahu = rahu_sidereal
-        prev_ketu = ketu_sidereal
-        prev_time = current
-        current += timedelta(minutes=1)
+    # Sort results by location and time
+    results.sort(key=lambda x: (x[0], x[1]))
 
-# Sort results by location and time
-results.sort(key=lambda x: (x[0], x[1]))
+    # Display table
+    print(tabulate(results, headers=['Location', 'Local Time', 'Node'], tablefmt='grid'))
 
-# Display table
-print(tabulate(results, headers=['Location', 'Local Time', 'Node'], tablefmt='grid'))
+    # Which ephemeris backend served each body (warns about Moshier fallback)
+    print(provider.report())
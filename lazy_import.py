@@ -0,0 +1,22 @@
+import importlib
+
+
+class LazyModule:
+    # Stands in for a module and imports it on first attribute access, so
+    # importing the calculation modules does not pay for swisseph, pytz etc.
+    # until something is actually computed.
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        value = getattr(self._module, attr)
+        # Cache on the instance so later lookups skip __getattr__
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
@@ -0,0 +1,231 @@
+import math
+import os
+from collections import namedtuple
+from multiprocessing import Pool, shared_memory
+
+import ascendant_table
+import crossings
+from sidereal import sidereal_longitude_jd, rahu_longitude, ketu_longitude
+
+
+# Parallel driver for multi-year scans. The range is split into chunks that
+# are scanned by worker processes; each worker gets a slice of one
+# preallocated shared memory block and writes its events there as float64
+# records (jd, kind, value), returning only the event count. Chunks overlap
+# so crossings at a boundary are seen, and every chunk only keeps the events
+# it owns (lo < jd <= hi), so the parent reads the slices back in chunk order
+# without pickling, copying or deduplicating.
+
+RECORD_SIZE = 3  # jd, kind, value
+EVENT_MARGIN = 16  # spare records per chunk on top of the estimate
+
+# kind: scanner-specific event type (pair index, node/offset index);
+# value: scanner-specific detail (multiple of the period, orb offset)
+Event = namedtuple('Event', ['jd', 'kind', 'value'])
+
+# scan(jd_lo, jd_hi, **params) -> iterable of (jd, kind, value) in time order
+# overlap(**params) -> days scanned before each chunk
+# rate(**params) -> upper estimate of events per day
+Scanner = namedtuple('Scanner', ['scan', 'overlap', 'rate'])
+
+# Rough upper bounds of daily motion (degrees) used to size the buffers;
+# a chunk that still overflows is rescanned in the parent
+DAILY_MOTION = {'ASC': 400.0}
+DEFAULT_DAILY_MOTION = 16.0  # the Moon; every other body is slower
+
+NODES = (('Rahu', rahu_longitude), ('Ketu', ketu_longitude))
+
+
+# --- sidereal longitude scanner (generate_dates) ---
+
+def aspect_scan(jd_lo, jd_hi, bodies, pairs, ayanamsa_type, step_days, latitude=None, longitude=None):
+    # Crossing detector over a step grid starting at jd_lo; bodies are
+    # PLANETS ids, pairs crossings.Pair tuples over their positions
+    count = int((jd_hi - jd_lo) / step_days + 1e-9) + 1
+    jds = (jd_lo + n * step_days for n in range(count))
+
+    def longitudes_at(jd):
+        return [sidereal_longitude_jd(jd, body, ayanamsa_type, latitude, longitude) for body in bodies]
+
+    pairs = [crossings.Pair(*pair) for pair in pairs]
+    for event in crossings.scan(jds, longitudes_at, pairs):
+        yield event.jd, event.pair, event.multiple
+
+
+def aspect_overlap(step_days, **params):
+    # One step: the sample before the chunk carries the boundary crossing
+    return step_days
+
+
+def aspect_rate(bodies, pairs, **params):
+    rate = 0.0
+    for i, j, target, period in (crossings.Pair(*pair) for pair in pairs):
+        motion = DAILY_MOTION.get(bodies[i], DEFAULT_DAILY_MOTION)
+        if j is not None:
+            motion += DAILY_MOTION.get(bodies[j], DEFAULT_DAILY_MOTION)
+        rate += 2.0 * motion / period + 1.0
+    return rate
+
+
+# --- Ascendant scanner (the ke-ra-rising scripts) ---
+
+def rising_scan(jd_lo, jd_hi, latitude, geo_lon, offsets=(0.0,)):
+    # Ascendant crossings of Rahu / Ketu + offset from the ascendant table;
+    # kind = node * len(offsets) + offset index (0 = Rahu), value = offset.
+    # offsets (-orb, +orb) give the enter / exit of the orb windows.
+    events = []
+    for n, (_, node) in enumerate(NODES):
+        for m, offset in enumerate(offsets):
+            target = (lambda jd, node=node, offset=offset: node(jd) + offset)
+            for jd in ascendant_table.find_crossings(jd_lo, jd_hi, latitude, geo_lon, target):
+                events.append((jd, n * len(offsets) + m, offset))
+    events.sort()
+    return events
+
+
+def rising_overlap(**params):
+    return 0.05
+
+
+def rising_rate(offsets=(0.0,), **params):
+    # Each target rises once per sidereal day
+    return 2.0 * len(NODES) * len(offsets)
+
+
+SCANNERS = {
+    'aspects': Scanner(aspect_scan, aspect_overlap, aspect_rate),
+    'rising': Scanner(rising_scan, rising_overlap, rising_rate),
+}
+
+
+# --- driver ---
+
+def _owned_events(scanner, jd_lo, jd_hi, first, params):
+    # Events of one chunk: scan from jd_lo - overlap and keep lo < jd <= hi
+    # (the first chunk also keeps jd == lo)
+    scan = SCANNERS[scanner]
+    overlap = scan.overlap(**params)
+    for jd, kind, value in scan.scan(jd_lo - overlap, jd_hi, **params):
+        if (jd > jd_lo or (first and jd == jd_lo)) and jd <= jd_hi:
+            yield jd, kind, value
+
+
+def _scan_chunk(task):
+    # Worker: scan one chunk into its slice of the shared block. The true
+    # event count is stored in front of the records; if it exceeds the
+    # capacity the parent rescans the chunk itself.
+    shm_name, offset, capacity, scanner, jd_lo, jd_hi, first, params = task
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buf = shm.buf.cast('d')
+    try:
+        count = 0
+        pos = offset + 1
+        for record in _owned_events(scanner, jd_lo, jd_hi, first, params):
+            if count < capacity:
+                buf[pos], buf[pos + 1], buf[pos + 2] = record
+                pos += RECORD_SIZE
+            count += 1
+        buf[offset] = count
+    finally:
+        # The view must go before close(), or a scan error turns into BufferError
+        buf.release()
+        shm.close()
+    return count
+
+
+class ScanResult:
+    # Events of a parallel scan, read straight from the shared block in
+    # chunk (= time) order. Close it (or use it as a context manager) to
+    # free the shared memory.
+    def __init__(self, shm, chunks, capacity, overflow):
+        self._shm = shm
+        self._buf = shm.buf.cast('d')
+        self._chunks = chunks
+        self._capacity = capacity
+        self._overflow = overflow  # chunk index -> events rescanned in the parent
+
+    def chunk_counts(self):
+        return [len(self._overflow[k]) if k in self._overflow else int(self._buf[self._offset(k)])
+                for k in range(self._chunks)]
+
+    def _offset(self, k):
+        return k * (1 + self._capacity * RECORD_SIZE)
+
+    def __len__(self):
+        return sum(self.chunk_counts())
+
+    def __iter__(self):
+        buf = self._buf
+        for k in range(self._chunks):
+            if k in self._overflow:
+                for jd, kind, value in self._overflow[k]:
+                    yield Event(jd, int(kind), value)
+                continue
+            offset = self._offset(k)
+            pos = offset + 1
+            for _ in range(int(buf[offset])):
+                yield Event(buf[pos], int(buf[pos + 1]), buf[pos + 2])
+                pos += RECORD_SIZE
+
+    def close(self):
+        if self._shm is not None:
+            self._buf.release()
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def chunk_bounds(jd_start, jd_end, chunks, align=0.0):
+    # Split [jd_start, jd_end] into chunk (lo, hi) bounds; with align the
+    # inner bounds fall on the jd_start + n * align grid so chunked step
+    # scans sample exactly the same times as one serial scan
+    size = (jd_end - jd_start) / chunks
+    bounds = [jd_start]
+    for k in range(1, chunks):
+        edge = jd_start + k * size
+        if align:
+            edge = jd_start + round(k * size / align) * align
+        if bounds[-1] < edge < jd_end:
+            bounds.append(edge)
+    bounds.append(jd_end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def parallel_scan(scanner, jd_start, jd_end, params, processes=None, chunks=None):
+    # Scan [jd_start, jd_end] with SCANNERS[scanner] in worker processes.
+    # params are the scanner's keyword arguments (plain picklable values).
+    # Returns a ScanResult; events are in time order for each chunk and the
+    # chunks are in time order.
+    scan = SCANNERS[scanner]
+    if chunks is None:
+        chunks = 4 * (processes or os.cpu_count() or 1)
+    bounds = chunk_bounds(jd_start, jd_end, chunks, params.get('step_days', 0.0))
+    longest = max(hi - lo for lo, hi in bounds) + scan.overlap(**params)
+    capacity = int(math.ceil(longest * scan.rate(**params))) + EVENT_MARGIN
+
+    slot = 1 + capacity * RECORD_SIZE
+    shm = shared_memory.SharedMemory(create=True, size=len(bounds) * slot * 8)
+    try:
+        tasks = [(shm.name, k * slot, capacity, scanner, lo, hi, k == 0, params)
+                 for k, (lo, hi) in enumerate(bounds)]
+        if processes == 1:
+            counts = [_scan_chunk(task) for task in tasks]
+        else:
+            with Pool(processes) as pool:
+                counts = pool.map(_scan_chunk, tasks, chunksize=1)
+        overflow = {}
+        for k, count in enumerate(counts):
+            if count > capacity:
+                lo, hi = bounds[k]
+                overflow[k] = list(_owned_events(scanner, lo, hi, k == 0, params))
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return ScanResult(shm, len(bounds), capacity, overflow)
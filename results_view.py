@@ -0,0 +1,208 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+# Virtualized results table for the Tkinter apps. Rows live in a plain Python
+# list; the Treeview only ever holds as many items as fit on screen and those
+# items are refilled as the user scrolls. Inserting, clearing, sorting and
+# filtering therefore cost list operations instead of one Tk call per row,
+# which keeps 50k+ row scans browsable.
+
+DEFAULT_ROW_HEIGHT = 20
+ALL_COLUMNS = 'All columns'
+
+
+def _sort_key(value):
+    # Numbers sort numerically, everything else as text
+    try:
+        return (0, float(value), '')
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value).lower())
+
+
+class VirtualTable(ttk.Frame):
+    def __init__(self, master, columns, headings, widths, height=15):
+        super().__init__(master)
+        self.columns = list(columns)
+        self.headings = list(headings)
+        self._rows = []  # backing store, insertion order
+        self._view = []  # indexes into _rows after filter and sort
+        self._offset = 0
+        self._visible = height
+        self._sort_column = None
+        self._sort_reverse = False
+        self._filter_column = None
+        self._filter_text = ''
+        self._render_pending = False
+        self._view_dirty = False  # _view must be rebuilt before use
+
+        # Filter bar: column choice + text
+        bar = ttk.Frame(self)
+        bar.pack(side="top", fill="x")
+        ttk.Label(bar, text="Filter:").pack(side="left")
+        self._filter_col_var = tk.StringVar(value=ALL_COLUMNS)
+        ttk.Combobox(bar, textvariable=self._filter_col_var, state='readonly', width=14,
+                     values=[ALL_COLUMNS] + self.headings).pack(side="left", padx=2)
+        self._filter_var = tk.StringVar()
+        ttk.Entry(bar, textvariable=self._filter_var, width=24).pack(side="left", padx=2)
+        self._count_var = tk.StringVar(value='0 rows')
+        ttk.Label(bar, textvariable=self._count_var).pack(side="right")
+        self._filter_var.trace_add('write', lambda *_: self._on_filter_change())
+        self._filter_col_var.trace_add('write', lambda *_: self._on_filter_change())
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show="headings", height=height, selectmode='browse')
+        for col, text, width in zip(self.columns, self.headings, widths):
+            self.tree.heading(col, text=text, command=lambda c=col: self._on_heading(c))
+            self.tree.column(col, width=width, anchor='w')
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Up>', lambda e: self.scroll(-1) or 'break')
+        self.tree.bind('<Down>', lambda e: self.scroll(1) or 'break')
+        self.tree.bind('<Prior>', lambda e: self.scroll(-self._visible) or 'break')
+        self.tree.bind('<Next>', lambda e: self.scroll(self._visible) or 'break')
+        self.tree.bind('<Home>', lambda e: self.scroll_to(0) or 'break')
+        self.tree.bind('<End>', lambda e: self.scroll_to(len(self._view)) or 'break')
+
+    # --- data ---
+
+    def append(self, values):
+        self.extend([values])
+
+    def extend(self, rows):
+        start = len(self._rows)
+        self._rows.extend(tuple(r) for r in rows)
+        if self._sort_column is None and not self._view_dirty:
+            # Unsorted view: new rows go to the end if they pass the filter
+            self._view.extend(i for i in range(start, len(self._rows)) if self._matches(self._rows[i]))
+        else:
+            # Sorted view: re-sort once at the next redraw, not once per append
+            self._view_dirty = True
+        self._schedule_render()
+
+    def clear(self):
+        self._rows = []
+        self._view = []
+        self._view_dirty = False
+        self._offset = 0
+        self._schedule_render()
+
+    def rows(self):
+        # Rows as currently shown (filtered and sorted), e.g. for export
+        self._update_view()
+        return [self._rows[i] for i in self._view]
+
+    # --- sort and filter ---
+
+    def sort_by(self, column, reverse=False):
+        self._sort_column = column
+        self._sort_reverse = reverse
+        self._rebuild_view()
+
+    def set_filter(self, column, text):
+        # column None filters on all columns; matching is case-insensitive
+        self._filter_column = column
+        self._filter_text = text.lower()
+        self._rebuild_view()
+
+    def _matches(self, row):
+        if not self._filter_text:
+            return True
+        if self._filter_column is None:
+            return any(self._filter_text in str(v).lower() for v in row)
+        return self._filter_text in str(row[self.columns.index(self._filter_column)]).lower()
+
+    def _rebuild_view(self):
+        # Filter or sort changed: rebuild at the next redraw, back to the top
+        self._view_dirty = True
+        self._offset = 0
+        self._schedule_render()
+
+    def _update_view(self):
+        if not self._view_dirty:
+            return
+        self._view_dirty = False
+        view = [i for i, row in enumerate(self._rows) if self._matches(row)]
+        if self._sort_column is not None:
+            c = self.columns.index(self._sort_column)
+            rows = self._rows
+            view.sort(key=lambda i: _sort_key(rows[i][c]), reverse=self._sort_reverse)
+        self._view = view
+
+    def _on_heading(self, column):
+        # Click toggles ascending/descending; headings show the direction
+        reverse = not self._sort_reverse if self._sort_column == column else False
+        for col, text in zip(self.columns, self.headings):
+            arrow = (' ▼' if reverse else ' ▲') if col == column else ''
+            self.tree.heading(col, text=text + arrow)
+        self.sort_by(column, reverse)
+
+    def _on_filter_change(self):
+        col_text = self._filter_col_var.get()
+        column = None if col_text == ALL_COLUMNS else self.columns[self.headings.index(col_text)]
+        self.set_filter(column, self._filter_var.get())
+
+    # --- scrolling and rendering ---
+
+    def scroll(self, delta):
+        self.scroll_to(self._offset + delta)
+
+    def scroll_to(self, offset):
+        self._update_view()
+        offset = max(0, min(int(offset), max(0, len(self._view) - self._visible)))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        self._update_view()
+        if action == 'moveto':
+            self.scroll_to(float(amount) * len(self._view))
+        elif action == 'scroll':
+            step = self._visible if unit == 'pages' else 1
+            self.scroll(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        row_height = ttk.Style().lookup('Treeview', 'rowheight') or DEFAULT_ROW_HEIGHT
+        # Leave room for the heading row
+        visible = max(1, int(event.height) // int(row_height) - 1)
+        if visible != self._visible:
+            self._visible = visible
+            self.scroll_to(self._offset)
+            self._render()
+
+    def _schedule_render(self):
+        # Coalesce many appends into one redraw
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self):
+        self._render_pending = False
+        self._update_view()
+        self._offset = max(0, min(self._offset, len(self._view) - self._visible))
+        items = self.tree.get_children()
+        wanted = max(0, min(self._visible, len(self._view) - self._offset))
+        # Keep a pool of exactly as many Treeview items as rows on screen
+        for iid in items[wanted:]:
+            self.tree.delete(iid)
+        for _ in range(len(items), wanted):
+            self.tree.insert('', 'end', values=())
+        for k, iid in enumerate(self.tree.get_children()):
+            self.tree.item(iid, values=self._rows[self._view[self._offset + k]])
+        total = len(self._view)
+        if total:
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + self._visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        shown = f"{total} rows" if total == len(self._rows) else f"{total} of {len(self._rows)} rows"
+        self._count_var.set(shown)
@@ -0,0 +1,188 @@
+import time
+from bisect import bisect_left
+from collections import namedtuple
+from itertools import combinations
+
+from clusters import circular_span
+
+
+# Oracle for the scan engines: a dense brute-force reference scan and any
+# number of optimized strategies are run over the same fixed range, their
+# events are matched by label within a time tolerance and each strategy is
+# reported with its misses, duplicates, extra events, time error and speedup.
+# Cases and strategies live in compare-scan-strategies.py.
+
+SECOND = 1.0 / 86400  # one second in days
+REFINE_PRECISION = 0.1 * SECOND  # reference crossings are bisected to 0.1 s
+
+# label tells events of different kinds apart (node, pair, enter/exit, ...);
+# events only match events with the same label
+Event = namedtuple('Event', ['jd', 'label'])
+
+# errors: candidate minus reference time in seconds for every matched event
+Match = namedtuple('Match', ['errors', 'misses', 'duplicates', 'extras'])
+
+Report = namedtuple('Report', ['case', 'strategy', 'expected', 'found', 'misses', 'duplicates',
+                               'extras', 'max_error', 'mean_error', 'seconds', 'speedup'])
+
+
+def match_events(reference, candidate, tolerance):
+    # Pair every candidate event with the nearest reference event of the same
+    # label within tolerance (days). The closest candidate claims a reference
+    # event; further candidates near it are duplicates, candidates near none
+    # are extras and unclaimed reference events are misses.
+    by_label = {}
+    for event in reference:
+        by_label.setdefault(event.label, []).append(event.jd)
+    for times in by_label.values():
+        times.sort()
+
+    nearest = []
+    extras = []
+    for event in candidate:
+        times = by_label.get(event.label, [])
+        k = bisect_left(times, event.jd)
+        best = None
+        for m in (k - 1, k):
+            if 0 <= m < len(times) and (best is None or abs(times[m] - event.jd) < abs(times[best] - event.jd)):
+                best = m
+        if best is None or abs(times[best] - event.jd) > tolerance:
+            extras.append(event)
+        else:
+            nearest.append((abs(times[best] - event.jd), event, best))
+
+    claimed = set()
+    errors = []
+    duplicates = []
+    for _, event, m in sorted(nearest, key=lambda n: n[0]):
+        key = (event.label, m)
+        if key in claimed:
+            duplicates.append(event)
+        else:
+            claimed.add(key)
+            errors.append((event.jd - by_label[event.label][m]) / SECOND)
+
+    misses = [Event(jd, label) for label, times in by_label.items()
+              for m, jd in enumerate(times) if (label, m) not in claimed]
+    return Match(errors, misses, duplicates, extras)
+
+
+def refine_root(f, a, b, fa, precision=REFINE_PRECISION):
+    # Bisect a sign change of f between a and b (fa = f(a))
+    while b - a > precision:
+        mid = (a + b) / 2.0
+        fm = f(mid)
+        if (fm < 0.0) == (fa < 0.0):
+            a, fa = mid, fm
+        else:
+            b = mid
+    return (a + b) / 2.0
+
+
+def dense_crossings(jd_start, jd_end, step, functions, precision=REFINE_PRECISION):
+    # Reference crossings: sample every function on a dense grid and bisect
+    # each sign change down to precision. functions maps label -> f(jd),
+    # a wrapped difference in degrees; jumps of 180° or more are the wrap
+    # point and are skipped.
+    events = []
+    for label, f in functions.items():
+        count = int((jd_end - jd_start) / step + 1e-9) + 1
+        prev_jd = prev = None
+        for n in range(count):
+            jd = jd_start + n * step
+            value = f(jd)
+            if prev is not None and (prev < 0.0) != (value < 0.0) and abs(value - prev) < 180.0:
+                events.append(Event(refine_root(f, prev_jd, jd, prev, precision), label))
+            prev_jd, prev = jd, value
+    events.sort()
+    return events
+
+
+def brute_force_clusters(lons, orb, k):
+    # Maximal groups of at least k bodies within orb, by testing every subset
+    found = []
+    for size in range(len(lons), k - 1, -1):
+        for members in combinations(range(len(lons)), size):
+            members = frozenset(members)
+            if any(members < bigger for bigger in found):
+                continue
+            if circular_span([lons[i] for i in members]) <= orb:
+                found.append(members)
+    return found
+
+
+def dense_clusters(jd_start, jd_end, step, longitudes_at, orb, k, names, precision=REFINE_PRECISION):
+    # Reference cluster scan: brute-force clusters at every step; a cluster
+    # appearing / disappearing between two steps is bisected to precision
+    # and gives an enter / exit event
+    events = []
+    active = set()
+    count = int((jd_end - jd_start) / step + 1e-9) + 1
+    for n in range(count):
+        jd = jd_start + n * step
+        current = set(brute_force_clusters(longitudes_at(jd), orb, k))
+        if n > 0:
+            for kind, changed in (('enter', current - active), ('exit', active - current)):
+                for members in changed:
+                    def f(t, members=members, kind=kind):
+                        # Negative while the cluster is in its state before the change
+                        present = members in brute_force_clusters(longitudes_at(t), orb, k)
+                        return 1.0 if present == (kind == 'enter') else -1.0
+                    jd_change = refine_root(f, jd - step, jd, -1.0, precision)
+                    events.append(Event(jd_change, cluster_label(kind, members, names)))
+        active = current
+    events.sort()
+    return events
+
+
+def cluster_label(kind, members, names):
+    return kind + ' ' + '+'.join(names[i] for i in sorted(members))
+
+
+def timed(fn):
+    # (result, seconds); the result is materialized so generators are timed too
+    t = time.perf_counter()
+    result = list(fn())
+    return result, time.perf_counter() - t
+
+
+def compare(case, reference, strategies, tolerance):
+    # reference: callable returning the oracle events; strategies: list of
+    # (name, callable). Returns one Report per strategy.
+    expected, reference_seconds = timed(reference)
+    reports = []
+    for name, strategy in strategies:
+        found, seconds = timed(strategy)
+        match = match_events(expected, found, tolerance)
+        errors = [abs(e) for e in match.errors]
+        reports.append(Report(
+            case, name, len(expected), len(found), len(match.misses), len(match.duplicates),
+            len(match.extras),
+            max(errors) if errors else 0.0,
+            sum(errors) / len(errors) if errors else 0.0,
+            seconds,
+            reference_seconds / seconds if seconds > 0 else float('inf'),
+        ))
+    return reports
+
+
+def format_reports(reports):
+    headers = ['Case', 'Strategy', 'Expected', 'Found', 'Misses', 'Dupes', 'Extras',
+               'Max err (s)', 'Mean err (s)', 'Time (s)', 'Speedup']
+    rows = [[r.case, r.strategy, r.expected, r.found, r.misses, r.duplicates, r.extras,
+             f"{r.max_error:.1f}", f"{r.mean_error:.1f}", f"{r.seconds:.3f}", f"{r.speedup:.1f}x"]
+            for r in reports]
+    widths = [max(len(str(row[c])) for row in [headers] + rows) for c in range(len(headers))]
+    lines = []
+    for n, row in enumerate([headers] + rows):
+        lines.append('  '.join(str(v).ljust(w) if c < 2 else str(v).rjust(w)
+                               for c, (v, w) in enumerate(zip(row, widths))))
+        if n == 0:
+            lines.append('  '.join('-' * w for w in widths))
+    return '\n'.join(lines)
+
+
+def accepted(report):
+    # A strategy is acceptable when every reference event is found exactly
+    # once (within the case tolerance) and nothing spurious is reported
+    return report.misses == 0 and report.duplicates == 0 and report.extras == 0
@@ -0,0 +1,94 @@
+import ephemeris
+from lazy_import import LazyModule
+
+swe = LazyModule('swisseph')
+
+
+# Calculation core shared by the Tkinter apps and the scripts. Importing it
+# has no side effects: swisseph is loaded on first use and PLANETS /
+# AYANAMSAS are built on first access, so worker processes and CLI tools
+# can import it without Tk, tkcalendar or pytz.
+
+
+def _planets():
+    # Planets: All planets, North Node, South Node, Ascendant
+    return [
+        ("Sun", swe.SUN),
+        ("Moon", swe.MOON),
+        ("Mercury", swe.MERCURY),
+        ("Venus", swe.VENUS),
+        ("Mars", swe.MARS),
+        ("Jupiter", swe.JUPITER),
+        ("Saturn", swe.SATURN),
+        ("Uranus", swe.URANUS),
+        ("Neptune", swe.NEPTUNE),
+        ("Pluto", swe.PLUTO),
+        ("North Node", swe.MEAN_NODE),
+        ("South Node", "Ketu"),  # Special case handled in code
+        ("Ascendant (Rising)", "ASC"),  # Special case handled in code
+    ]
+
+
+def _ayanamsas():
+    return [
+        ("Lahiri", swe.SIDM_LAHIRI),
+        ("Raman", swe.SIDM_RAMAN),
+        ("Krishnamurti", swe.SIDM_KRISHNAMURTI),
+        ("Fagan/Bradley", swe.SIDM_FAGAN_BRADLEY),
+    ]
+
+
+_LAZY_CONSTANTS = {
+    'PLANETS': _planets,
+    'AYANAMSAS': _ayanamsas,
+}
+
+
+def __getattr__(name):
+    # Module-level PLANETS / AYANAMSAS, built when first accessed
+    if name in _LAZY_CONSTANTS:
+        value = _LAZY_CONSTANTS[name]()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def sidereal_longitudes(jds, planet, ayanamsa_type, latitude=None, longitude=None):
+    # Sidereal longitudes of one planet at every jd in jds
+    # Set sidereal mode based on ayanamsa type
+    swe.set_sid_mode(ayanamsa_type, 0, 0)
+    flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL
+    calc = ephemeris.get_provider().longitude
+
+    if planet == "Ketu":
+        # South Node is always opposite to North Node (Mean Node)
+        return [(calc(jd, swe.MEAN_NODE, flags) + 180.0) % 360.0 for jd in jds]
+
+    elif planet == "ASC":
+        # Ascendant needs latitude, longitude, and ayanamsa
+        if latitude is None or longitude is None:
+            raise ValueError("Latitude and Longitude required for Ascendant calculation")
+
+        # Tropical Ascendant (Placidus houses), adjusted for the ayanamsa to
+        # get the sidereal position
+        houses = swe.houses
+        ayanamsa = swe.get_ayanamsa_ut
+        return [(houses(jd, latitude, longitude, b'P')[1][0] - ayanamsa(jd)) % 360 for jd in jds]
+
+    else:
+        # For regular planets and Rahu
+        return [calc(jd, planet, flags) for jd in jds]
+
+
+def sidereal_longitude_jd(jd, planet, ayanamsa_type, latitude=None, longitude=None):
+    return sidereal_longitudes((jd,), planet, ayanamsa_type, latitude, longitude)[0]
+
+
+def rahu_longitude(jd):
+    # Tropical Mean Node (Rahu); the Ascendant and the nodes share the
+    # ayanamsha, so sidereal conjunctions happen at the tropical moment
+    return ephemeris.get_provider().longitude(jd, swe.MEAN_NODE)
+
+
+def ketu_longitude(jd):
+    return (rahu_longitude(jd) + 180) % 360
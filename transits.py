@@ -0,0 +1,125 @@
+from bisect import bisect_right
+from collections import namedtuple
+
+import sidereal
+
+
+# Transits to many natal charts in one pass. Every natal point of every
+# chart, shifted by every aspect angle, goes into one sorted array of target
+# longitudes. At each timestep the transiting bodies are computed once; the
+# arc a body moved since the previous step is looked up in the sorted array
+# with bisection, so each step costs O(bodies * log(targets) + hits) and the
+# run scales with the number of timesteps, not timesteps x charts.
+
+STEP_DAYS = 1.0 / 24  # one hour, as the generator
+ASPECTS = (0.0, 60.0, 90.0, 120.0, 180.0)
+
+# points: list of (name, sidereal longitude)
+NatalChart = namedtuple('NatalChart', ['name', 'points'])
+
+# chart / point: names from the NatalChart; transit: PLANETS name; aspect:
+# transiting minus natal longitude at the hit (90 and -90 are the two
+# squares); retrograde: the body was moving backwards
+TransitEvent = namedtuple('TransitEvent', ['jd', 'chart', 'transit', 'point', 'aspect', 'retrograde'])
+
+
+def natal_chart(name, jd, ayanamsa_type, latitude=None, longitude=None, planets=None):
+    # Natal points from PLANETS; the Ascendant is left out without a location
+    points = []
+    for label, planet in planets or sidereal.PLANETS:
+        if planet == "ASC" and (latitude is None or longitude is None):
+            continue
+        points.append((label, sidereal.sidereal_longitude_jd(jd, planet, ayanamsa_type, latitude, longitude)))
+    return NatalChart(name, points)
+
+
+def transit_bodies():
+    # Every PLANETS body except the Ascendant, which has no single transit
+    # position for charts from different places
+    return [(label, planet) for label, planet in sidereal.PLANETS if planet != "ASC"]
+
+
+class TargetIndex:
+    # Sorted target longitudes (natal point + aspect) of all charts, with the
+    # chart, point and aspect of each target in parallel lists
+    def __init__(self, charts, aspects=ASPECTS):
+        targets = []
+        for c, chart in enumerate(charts):
+            for p, (_, lon) in enumerate(chart.points):
+                for angle in aspects:
+                    angle = abs(angle) % 360.0
+                    # Conjunction and opposition are one target, others two
+                    signed = (angle,) if angle % 180.0 == 0 else (angle, -angle)
+                    for a in signed:
+                        targets.append(((lon + a) % 360.0, c, p, a))
+        targets.sort()
+        self.longitudes = [t[0] for t in targets]
+        self.charts = [t[1] for t in targets]
+        self.points = [t[2] for t in targets]
+        self.aspects = [t[3] for t in targets]
+
+    def __len__(self):
+        return len(self.longitudes)
+
+    def hits(self, low, high):
+        # Indexes of targets in the arc (low, high], 0 < high - low < 360;
+        # low may be any longitude and the arc may run across 0°
+        width = high - low
+        low %= 360.0
+        high = low + width
+        lons = self.longitudes
+        start = bisect_right(lons, low)
+        if high < 360.0:
+            return range(start, bisect_right(lons, high))
+        # Across 0°: (low, 360) then [0, high - 360]
+        return list(range(start, len(lons))) + list(range(0, bisect_right(lons, high - 360.0)))
+
+
+def scan_transits(charts, jd_start, jd_end, ayanamsa_type, bodies=None, aspects=ASPECTS,
+                  step_days=STEP_DAYS):
+    # Yield TransitEvents of bodies (PLANETS entries, default transit_bodies())
+    # to all natal charts over [jd_start, jd_end], in time order. Times are
+    # linearly interpolated within a step.
+    bodies = bodies or transit_bodies()
+    index = TargetIndex(charts, aspects)
+    if not len(index):
+        return
+    count = int((jd_end - jd_start) / step_days + 1e-9) + 1
+
+    prev = None
+    prev_jd = None
+    for n in range(count):
+        jd = jd_start + n * step_days
+        current = [sidereal.sidereal_longitude_jd(jd, planet, ayanamsa_type) for _, planet in bodies]
+        if prev is not None:
+            events = []
+            for b, (before, after) in enumerate(zip(prev, current)):
+                moved = (after - before + 180.0) % 360.0 - 180.0
+                if moved == 0.0:
+                    continue
+                # The target lies between the two positions, whichever way
+                # the body moved
+                low, high = (before, before + moved) if moved > 0 else (after, after - moved)
+                for t in index.hits(low, high):
+                    frac = ((index.longitudes[t] - before + 180.0) % 360.0 - 180.0) / moved
+                    chart = charts[index.charts[t]]
+                    events.append(TransitEvent(
+                        prev_jd + (jd - prev_jd) * frac,
+                        chart.name,
+                        bodies[b][0],
+                        chart.points[index.points[t]][0],
+                        index.aspects[t],
+                        moved < 0,
+                    ))
+            events.sort(key=lambda e: e.jd)
+            yield from events
+        prev = current
+        prev_jd = jd
+
+
+def events_by_chart(events):
+    # Group a stream of TransitEvents into {chart name: [events]}
+    grouped = {}
+    for event in events:
+        grouped.setdefault(event.chart, []).append(event)
+    return grouped